@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import sys
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Tuple, Union
+from enum import IntEnum
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 import os
-import pathlib
+import random
 import PyQt6
 from PyQt6.QtCore import Qt, QCoreApplication
 from PyQt6.QtGui import QAction
@@ -14,8 +16,8 @@ from PyQt6.QtWidgets import (
     QLabel,
     QLineEdit,
     QMainWindow,
+    QPlainTextEdit,
     QPushButton,
-    QTextBrowser,
     QVBoxLayout,
     QWidget,
 )
@@ -25,23 +27,177 @@ def normalize(text: str) -> str:
     return str(text).strip().lower()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Scene:
     text: List[str]
-    parse: Optional[Callable[[str], Union[str, Dict[str, Union[str, bool]]]]] = None
     danger: bool = False
 
 
+# Log line kinds; each value indexes into _KIND_HTML
+class _Kind(IntEnum):
+    GAME = 0
+    PLAYER = 1
+    SYSTEM = 2
+    DANGER = 3
+
+
+# Opening <span> (with the line color) for each _Kind
+_KIND_HTML: Tuple[str, ...] = (
+    '<span style="color:#e6e8f2">',
+    '<span style="color:#6c8cff">',
+    '<span style="color:#9aa0b6">',
+    '<span style="color:#ff6c6c">',
+)
+
+
+# Upper bound on log blocks kept in the output widget
+_MAX_LOG_BLOCKS = 2000
+
+
+# Hunt tuning per difficulty
+_DIFF: Dict[str, Dict[str, int]] = {
+    "easy": {"requiredClues": 3, "extraRooms": 0, "killers": 1, "lives": 0},
+    "medium": {"requiredClues": 5, "extraRooms": 1, "killers": 1, "lives": 0},
+    "hard": {"requiredClues": 8, "extraRooms": 2, "killers": 2, "lives": 1},
+}
+
+
+# Searchable spots per room; shared, read-only game content
+_ROOMS: Dict[str, Tuple[str, ...]] = {
+    "kitchen": ("oven", "under sink", "pantry", "stove"),
+    "bedroom": ("closet", "under bed", "behind curtains", "behind door"),
+    "garage": ("under car", "trunk", "backseat", "tool cabinet"),
+    "bathroom": ("tub", "under sink", "behind door", "toilet"),
+    "livingroom": ("sofa", "under rug", "tv cabinet", "bookshelf"),
+    "basement": ("workbench", "fuse box", "storage shelf", "laundry basket"),
+    "attic": ("old trunk", "rafters", "dusty boxes", "behind insulation"),
+    "office": ("desk drawer", "filing cabinet", "behind monitor", "under chair"),
+    "laundry": ("washer", "dryer", "detergent shelf", "laundry hamper"),
+    "study": ("globe", "secret panel", "under carpet", "curio cabinet"),
+}
+
+
+# Pre-rendered item prompt per room
+_ITEMS_HTML: Dict[str, str] = {
+    room: f"{_KIND_HTML[_Kind.SYSTEM]}You're in the {room}. Look where? ({' / '.join(items)})</span>"
+    for room, items in _ROOMS.items()
+}
+
+
+# Static scene content, built once at import; input handlers live on the window
+_STATIC_SCENE_TEXT: Dict[str, Tuple[List[str], bool]] = {
+    "prologue": (
+        [
+            "You are a homicide detective, called to a chilling case.",
+            "They call the suspect the 'House Hunter'—a predator who stalks homes after dark.",
+            "Find the clues, avoid the killer, and end the spree.",
+        ],
+        False,
+    ),
+    "start": (
+        [
+            "There is a killer on the loose. Should we try to stop them? (yes/no)",
+        ],
+        False,
+    ),
+    "investigate": (
+        [
+            "You choose to intervene. We need clues before the killer finds us.",
+            "Respond with anything to continue.",
+        ],
+        False,
+    ),
+    "hunt": (
+        [],
+        False,
+    ),
+    "avoid": (
+        [
+            "You decide to stay out of it and lock your doors.",
+            "Hours pass. Sirens wail in the distance. Guilt gnaws at you.",
+            "Do you change your mind and get involved? (yes/no)",
+        ],
+        False,
+    ),
+    "callPolice": (
+        [
+            "You call the police and report the last known location.",
+            "They advise you to keep your distance. Do you wait or head to the warehouse anyway? (wait/go)",
+        ],
+        False,
+    ),
+    "warehouse": (
+        [
+            "The warehouse is dark. You hear footsteps above. There is a loose pipe nearby.",
+            "Do you arm yourself with the pipe or quietly call out? (pipe/call)",
+        ],
+        False,
+    ),
+    # Endings
+    "ending_caught_by_killer": (
+        [
+            "You step into the room and the door slams behind you.",
+            "Breath at your neck. Wrong room. THE END.",
+        ],
+        True,
+    ),
+    "ending_all_clues": (
+        [
+            "Piece by piece, the truth emerges from the clues you gathered.",
+            "You alert the authorities with precise details. The killer is caught without another victim. THE END.",
+        ],
+        False,
+    ),
+    "ending_avoid": (
+        [
+            "Days later, the news reports an arrest made after another close call.",
+            "You are safe, but the what-ifs linger. THE END.",
+        ],
+        False,
+    ),
+    "ending_police_wait": (
+        [
+            "You wait. Police storm the warehouse and apprehend the suspect.",
+            "Your caution may have saved you—and someone else. THE END.",
+        ],
+        False,
+    ),
+    "ending_confront": (
+        [
+            "With the pipe in hand, you creak up the stairs. A shadow lunges.",
+            "You parry, shouting for help. Sirens swell outside—backup arrives just in time. THE END.",
+        ],
+        False,
+    ),
+    "ending_betrayed": (
+        [
+            '"Hello?" you whisper. The footsteps stop. A voice behind you: "Found you."',
+            "Trust can be deadly in the dark. THE END.",
+        ],
+        True,
+    ),
+}
+_SCENE_KEYS: frozenset[str] = frozenset(_STATIC_SCENE_TEXT)
+
+
+_PLUGIN_PATHS_INITED = False
+
+
 def _ensure_qt_plugin_paths() -> None:
     # Help Qt find the bundled platform plugins (e.g., 'cocoa') on macOS
-    pkg_dir = pathlib.Path(PyQt6.__file__).parent
-    plugins_dir = pkg_dir / "Qt6" / "plugins"
-    platforms_dir = plugins_dir / "platforms"
+    global _PLUGIN_PATHS_INITED
+    if _PLUGIN_PATHS_INITED or sys.platform != "darwin":
+        return
+    _PLUGIN_PATHS_INITED = True
+    pkg_dir = os.path.dirname(PyQt6.__file__)
+    plugins_dir = os.path.join(pkg_dir, "Qt6", "plugins")
+    platforms_dir = os.path.join(plugins_dir, "platforms")
     # Environment fallbacks
-    os.environ.setdefault("QT_PLUGIN_PATH", str(plugins_dir))
-    os.environ.setdefault("QT_QPA_PLATFORM_PLUGIN_PATH", str(platforms_dir))
+    os.environ.setdefault("QT_PLUGIN_PATH", plugins_dir)
+    os.environ.setdefault("QT_QPA_PLATFORM_PLUGIN_PATH", platforms_dir)
     # Qt runtime search path
-    QCoreApplication.addLibraryPath(str(plugins_dir))
+    if plugins_dir not in QCoreApplication.libraryPaths():
+        QCoreApplication.addLibraryPath(plugins_dir)
 
 
 class TextAdventureWindow(QMainWindow):
@@ -58,7 +214,7 @@ class TextAdventureWindow(QMainWindow):
             """
             QMainWindow, QWidget { background-color: #0f1220; color: #e6e8f2; }
             QLabel { color: #e6e8f2; font-size: 18px; font-weight: 600; }
-            QTextBrowser {
+            QPlainTextEdit {
                 background-color: #171a2b; color: #e6e8f2;
                 border: 1px solid #2a2f45; border-radius: 10px;
                 padding: 8px; font-size: 15px;
@@ -82,8 +238,11 @@ class TextAdventureWindow(QMainWindow):
             """
         )
 
-        self.output = QTextBrowser(self)
-        self.output.setOpenExternalLinks(False)
+        # Plain-text widget keeps long, append-only logs cheap to lay out;
+        # the block cap turns the log into a ring buffer that drops the oldest lines
+        self.output = QPlainTextEdit(self)
+        self.output.setReadOnly(True)
+        self.output.setMaximumBlockCount(_MAX_LOG_BLOCKS)
         self.output.setPlaceholderText("")
 
         self.input = QLineEdit(self)
@@ -112,92 +271,123 @@ class TextAdventureWindow(QMainWindow):
         self.input.returnPressed.connect(self.on_submit)
 
         self.current_scene_key: str = "start"
-        self.scenes: Dict[str, Scene] = self._build_scenes()
-        # Hunt mode state
-        self.rooms: Dict[str, List[str]] = {
-            "kitchen": ["oven", "under sink", "pantry", "stove"],
-            "bedroom": ["closet", "under bed", "behind curtains", "behind door"],
-            "garage": ["under car", "trunk", "backseat", "tool cabinet"],
-            "bathroom": ["tub", "under sink", "behind door", "toilet"],
-            "livingroom": ["sofa", "under rug", "tv cabinet", "bookshelf"],
-            "basement": ["workbench", "fuse box", "storage shelf", "laundry basket"],
-            "attic": ["old trunk", "rafters", "dusty boxes", "behind insulation"],
-            "office": ["desk drawer", "filing cabinet", "behind monitor", "under chair"],
-            "laundry": ["washer", "dryer", "detergent shelf", "laundry hamper"],
-            "study": ["globe", "secret panel", "under carpet", "curio cabinet"],
+        # Scene objects are built on first use (see the scenes property)
+        self._scenes_cache: Optional[Dict[str, Scene]] = None
+        # Scene key -> input handler, called as handler(raw_input, normalized_input).
+        # Handlers return None to stay silently, a scene key to move there, or any
+        # other string as feedback to show. Scenes without a handler are endings.
+        self._parse_table: Dict[str, Callable[[str, str], Optional[str]]] = {
+            "start": self._parse_start,
+            "investigate": self._parse_investigate,
+            "hunt": self._parse_hunt,
+            "avoid": self._parse_avoid,
+            "callPolice": self._parse_call_police,
+            "warehouse": self._parse_warehouse,
         }
+        # Hunt mode state
+        self.rooms: Dict[str, Tuple[str, ...]] = _ROOMS
         self.hunt_active: bool = False
         self.killer_room: Optional[str] = None  # legacy
         self.killer_rooms: List[str] = []
         self.active_rooms: List[str] = []
         self.required_clues: int = 0
-        self.clue_pairs: set[str] = set()
-        self.found_pairs: set[str] = set()
+        # Clue bookkeeping: one byte per (room, item) slot, indexed room_id * stride + item_id
+        self._room_idx: Dict[str, int] = {}
+        self._item_idx: Dict[str, Dict[str, int]] = {}
+        self._max_items: int = 0
+        self._clue_mask: bytearray = bytearray()
+        self._found_mask: bytearray = bytearray()
+        self._found_count: int = 0
+        # Input lookup tables: exact-match sets, unambiguous first words, and
+        # items longest-first for the substring fallback
+        self._room_set: frozenset[str] = frozenset()
+        self._items_by_room: Dict[str, Tuple[frozenset[str], Tuple[str, ...]]] = {}
+        self._item_first_token: Dict[str, Dict[str, str]] = {}
+        # Pre-rendered HTML for the room prompt lines that stay fixed for a whole hunt
+        self._rooms_html: str = ""
         self.hunt_mode: str = "choose-difficulty"  # then 'choose-room'/'choose-item'
         self.current_room: Optional[str] = None
         self.difficulty: Optional[str] = None
         self.lives: int = 0
-        # Show backstory (without changing current scene), then initial prompt
-        prologue = None
+        # Show backstory (without changing current scene), then initial prompt.
+        # Read straight from the static table so first paint doesn't build the scenes.
+        prologue = _STATIC_SCENE_TEXT["prologue"][0]
+        start_text = _STATIC_SCENE_TEXT["start"][0]
+        self._append_lines(
+            [(line, _Kind.SYSTEM) for line in prologue] + [(line, _Kind.GAME) for line in start_text]
+        )
+
+    @property
+    def scenes(self) -> Dict[str, Scene]:
+        if self._scenes_cache is None:
+            self._scenes_cache = self._build_scenes()
+        return self._scenes_cache
+
+    def _append_line(self, text: str, kind: int = _Kind.GAME) -> None:
+        # Simple styling via HTML spans. appendHtml only follows new output when the
+        # view is already at the bottom, so a player scrolled up to reread stays put
+        # and no cursor needs to be fetched or moved here.
+        self.output.appendHtml(_KIND_HTML[kind] + text + "</span>")
+
+    def _append_lines(self, lines: List[Tuple[str, int]]) -> None:
+        # One document mutation (and one repaint) for a whole block of lines
+        if not lines:
+            return
+        html = "<br>".join(
+            _KIND_HTML[kind] + text + "</span>" for text, kind in lines
+        )
+        with self._batch_append():
+            self.output.appendHtml(html)
+
+    @contextmanager
+    def _batch_append(self) -> Iterator[None]:
+        # Hold off repaints and change signals until the whole batch is in
+        self.output.setUpdatesEnabled(False)
+        was_blocked = self.output.blockSignals(True)
         try:
-            prologue = self._build_scenes()["prologue"].text
-        except Exception:
-            prologue = [
-                "You are a homicide detective, called to a chilling case.",
-                "They call the suspect the 'House Hunter'—a predator who stalks homes after dark.",
-                "Find the clues, avoid the killer, and end the spree.",
-            ]
-        for line in prologue:
-            self._append_line(line, "system")
-        self._render_scene("start")
-
-    def _append_line(self, text: str, kind: str = "game") -> None:
-        # Simple styling via HTML spans
-        color = {
-            "game": "#e6e8f2",
-            "player": "#6c8cff",
-            "system": "#9aa0b6",
-            "danger": "#ff6c6c",
-        }.get(kind, "#e6e8f2")
-        self.output.append(f'<span style="color:{color}">{text}</span>')
-        self.output.moveCursor(self.output.textCursor().MoveOperation.End)
+            yield
+        finally:
+            self.output.blockSignals(was_blocked)
+            self.output.setUpdatesEnabled(True)
 
     def _render_scene(self, key: str) -> None:
         scene = self.scenes.get(key)
         if not scene:
             return
-        for line in scene.text:
-            self._append_line(line, "danger" if scene.danger else "game")
+        kind = _Kind.DANGER if scene.danger else _Kind.GAME
+        if len(scene.text) > 1:
+            self._append_lines([(line, kind) for line in scene.text])
+        elif scene.text:
+            self._append_line(scene.text[0], kind)
         self.current_scene_key = key
         # If this scene has no parser, it's an ending. Prompt to restart.
-        if scene.parse is None:
-            self._append_line('Type "restart" to play again, or use the Restart menu.', "system")
+        if key not in self._parse_table:
+            self._append_line('Type "restart" to play again, or use the Restart menu.', _Kind.SYSTEM)
 
     def on_submit(self) -> None:
         value = self.input.text().strip()
         if not value:
             return
         self.input.clear()
-        self._append_line(f"> {value}", "player")
+        self._append_line(f"> {value}", _Kind.PLAYER)
 
-        if normalize(value) == "restart":
+        nvalue = normalize(value)
+        if nvalue == "restart":
             self.restart()
             return
 
-        scene = self.scenes.get(self.current_scene_key)
-        if not scene or scene.parse is None:
-            self._append_line('The story has ended. Type "restart" to begin again.', "system")
+        handler = self._parse_table.get(self.current_scene_key)
+        if handler is None:
+            self._append_line('The story has ended. Type "restart" to begin again.', _Kind.SYSTEM)
             return
 
-        result = scene.parse(value)
-        if isinstance(result, str):
-            self._render_scene(result)
-            return
-        if isinstance(result, dict) and result.get("stay"):
-            feedback = result.get("feedback")
-            if feedback:
-                self._append_line(str(feedback), "system")
+        result = handler(value, nvalue)
+        if result is None:
             return
+        if result in _SCENE_KEYS:
+            self._render_scene(result)
+        else:
+            self._append_line(result, _Kind.SYSTEM)
 
     def restart(self) -> None:
         self.output.clear()
@@ -207,8 +397,16 @@ class TextAdventureWindow(QMainWindow):
         self.killer_rooms = []
         self.active_rooms = []
         self.required_clues = 0
-        self.clue_pairs = set()
-        self.found_pairs = set()
+        self._room_idx = {}
+        self._item_idx = {}
+        self._max_items = 0
+        self._clue_mask = bytearray()
+        self._found_mask = bytearray()
+        self._found_count = 0
+        self._room_set = frozenset()
+        self._items_by_room = {}
+        self._item_first_token = {}
+        self._rooms_html = ""
         self.hunt_mode = "choose-difficulty"
         self.current_room = None
         self.difficulty = None
@@ -216,257 +414,197 @@ class TextAdventureWindow(QMainWindow):
         self._render_scene(self.current_scene_key)
 
     def show_about(self) -> None:
-        self._append_line("Homicide Detective — House Hunter case", "system")
-        self._append_line("A text-based investigation: find clues, avoid killer rooms, solve the case.", "system")
-        self._append_line("Web and desktop versions included. Type 'restart' anytime to begin again.", "system")
+        self._append_lines([
+            ("Homicide Detective — House Hunter case", _Kind.SYSTEM),
+            ("A text-based investigation: find clues, avoid killer rooms, solve the case.", _Kind.SYSTEM),
+            ("Web and desktop versions included. Type 'restart' anytime to begin again.", _Kind.SYSTEM),
+        ])
 
     def _build_scenes(self) -> Dict[str, Scene]:
-        def start_parse(inp: str) -> Union[str, Dict[str, Union[str, bool]]]:
-            t = normalize(inp)
-            if t in ["y", "yes", "yeah", "yep", "ok", "okay", "sure"]:
-                return "investigate"
-            if t in ["n", "no", "nope", "nah"]:
-                return "avoid"
-            return {"feedback": 'Please answer with "yes" or "no".', "stay": True}
-
-        def initialize_hunt(diff: str) -> None:
-            import random
-            DIFF = {
-                "easy": {"requiredClues": 3, "extraRooms": 0, "killers": 1, "lives": 0},
-                "medium": {"requiredClues": 5, "extraRooms": 1, "killers": 1, "lives": 0},
-                "hard": {"requiredClues": 8, "extraRooms": 2, "killers": 2, "lives": 1},
+        return {
+            key: Scene(text=text, danger=danger)
+            for key, (text, danger) in _STATIC_SCENE_TEXT.items()
+        }
+
+    def _parse_start(self, inp: str, t: str) -> Optional[str]:
+        if t in ["y", "yes", "yeah", "yep", "ok", "okay", "sure"]:
+            return "investigate"
+        if t in ["n", "no", "nope", "nah"]:
+            return "avoid"
+        return 'Please answer with "yes" or "no".'
+
+    def _initialize_hunt(self, diff: str) -> None:
+        _sample = random.sample
+        cfg = _DIFF[diff]
+        base_rooms = ["kitchen", "bedroom", "garage", "bathroom"]
+        extras_pool = [
+            "livingroom",
+            "basement",
+            "attic",
+            "office",
+            "laundry",
+            "study",
+        ]
+        extra_n = cfg["extraRooms"]
+        extras = _sample(extras_pool, k=min(extra_n, len(extras_pool)))
+        self.active_rooms = base_rooms + extras
+        self.required_clues = cfg["requiredClues"]
+        killers_n = cfg["killers"]
+        self.killer_rooms = _sample(self.active_rooms, k=min(killers_n, len(self.active_rooms)))
+        self.lives = cfg["lives"]
+        self._room_idx = {room: i for i, room in enumerate(self.active_rooms)}
+        self._item_idx = {
+            room: {item: j for j, item in enumerate(self.rooms[room])}
+            for room in self.active_rooms
+        }
+        self._max_items = max(len(self.rooms[room]) for room in self.active_rooms)
+        size = len(self.active_rooms) * self._max_items
+        self._clue_mask = bytearray(size)
+        self._found_mask = bytearray(size)
+        self._found_count = 0
+        self._room_set = frozenset(self.active_rooms)
+        self._items_by_room = {
+            room: (frozenset(self.rooms[room]), tuple(sorted(self.rooms[room], key=len, reverse=True)))
+            for room in self.active_rooms
+        }
+        self._item_first_token = {}
+        for room in self.active_rooms:
+            firsts = [item.split()[0] for item in self.rooms[room]]
+            self._item_first_token[room] = {
+                first: item
+                for first, item in zip(firsts, self.rooms[room])
+                if firsts.count(first) == 1
             }
-            base_rooms = ["kitchen", "bedroom", "garage", "bathroom"]
-            extras_pool = [
-                "livingroom",
-                "basement",
-                "attic",
-                "office",
-                "laundry",
-                "study",
-            ]
-            extra_n = DIFF[diff]["extraRooms"]
-            extras = random.sample(extras_pool, k=min(extra_n, len(extras_pool)))
-            self.active_rooms = base_rooms + extras
-            self.required_clues = DIFF[diff]["requiredClues"]
-            killers_n = DIFF[diff]["killers"]
-            self.killer_rooms = random.sample(self.active_rooms, k=min(killers_n, len(self.active_rooms)))
-            self.lives = DIFF[diff]["lives"]
-            # Build all pairs excluding killer room
-            all_pairs: List[str] = []
-            for room in self.active_rooms:
-                for item in self.rooms[room]:
-                    all_pairs.append(f"{room}|{item}")
-            candidates = [
-                p for p in all_pairs
-                if not any(p.startswith(kr + "|") for kr in self.killer_rooms)
-            ]
-            k = min(self.required_clues, len(candidates))
-            self.clue_pairs = set(random.sample(candidates, k=k))
-            self.found_pairs = set()
-            self.hunt_mode = "choose-room"
-            self.current_room = None
-            self.hunt_active = True
-            self.difficulty = diff
+        sys_prefix = _KIND_HTML[_Kind.SYSTEM]
+        self._rooms_html = (
+            f"{sys_prefix}Rooms: {', '.join(self.active_rooms)}</span><br>"
+            f"{sys_prefix}Choose a room to search. Type the room name.</span>"
+        )
+        # Candidate clue slots: every (room, item) outside the killer rooms
+        killer_set = set(self.killer_rooms)
+        stride = self._max_items
+        candidates = [
+            self._room_idx[room] * stride + item_id
+            for room in self.active_rooms
+            if room not in killer_set
+            for item_id in range(len(self.rooms[room]))
+        ]
+        for idx in _sample(candidates, k=min(self.required_clues, len(candidates))):
+            self._clue_mask[idx] = 1
+        self.hunt_mode = "choose-room"
+        self.current_room = None
+        self.hunt_active = True
+        self.difficulty = diff
+
+    def _prompt_rooms(self) -> None:
+        # Only the status line changes between turns; the rest is cached per hunt
+        diff = f" • Difficulty: {self.difficulty}" if self.difficulty else ""
+        status = (
+            f"Status — Clues: {self._found_count}/{self.required_clues}"
+            + (f" • Lives: {self.lives}" if self.lives else "")
+            + diff
+        )
+        self.output.appendHtml(f'{_KIND_HTML[_Kind.SYSTEM]}{status}</span><br>{self._rooms_html}')
 
-        def prompt_rooms():
-            rooms_text = ", ".join(self.active_rooms)
-            # Status line
-            diff = f" • Difficulty: {self.difficulty}" if self.difficulty else ""
-            self._append_line(
-                f"Status — Clues: {len(self.found_pairs)}/{self.required_clues}"
-                + (f" • Lives: {self.lives}" if self.lives else "")
-                + diff,
-                "system",
-            )
-            self._append_line(f"Rooms: {rooms_text}", "system")
-            self._append_line("Choose a room to search. Type the room name.", "system")
+    def _prompt_items(self, room: str) -> None:
+        self.output.appendHtml(_ITEMS_HTML[room])
 
-        def prompt_items(room: str):
-            items = self.rooms[room]
-            self._append_line(
-                f"You're in the {room}. Look where? ({' / '.join(items)})",
-                "system",
-            )
+    def _parse_investigate(self, inp: str, t: str) -> Optional[str]:
+        self.hunt_active = True
+        self.hunt_mode = "choose-difficulty"
+        self._append_line(
+            "Choose a difficulty: easy (3 clues), medium (5, +1 room), hard (8, +2 rooms).",
+            _Kind.SYSTEM,
+        )
+        self._append_line("Type: easy, medium, or hard.", _Kind.SYSTEM)
+        return "hunt"
 
-        def investigate_parse(inp: str) -> Union[str, Dict[str, Union[str, bool]]]:
+    def _parse_hunt(self, inp: str, t: str) -> Optional[str]:
+        if not self.hunt_active:
             self.hunt_active = True
             self.hunt_mode = "choose-difficulty"
+            self._append_line("Type: easy, medium, or hard.", _Kind.SYSTEM)
+            return None
+        if self.hunt_mode == "choose-difficulty":
+            if t not in ("easy", "medium", "hard"):
+                return "Type: easy, medium, or hard."
+            self._initialize_hunt(t)
             self._append_line(
-                "Choose a difficulty: easy (3 clues), medium (5, +1 room), hard (8, +2 rooms).",
-                "system",
+                f"Find {self.required_clues} clues without entering the killer's room.",
+                _Kind.SYSTEM,
             )
-            self._append_line("Type: easy, medium, or hard.", "system")
-            return "hunt"
-        def hunt_parse(inp: str) -> Union[str, Dict[str, Union[str, bool]]]:
-            t = normalize(inp)
-            if not self.hunt_active:
-                self.hunt_active = True
-                self.hunt_mode = "choose-difficulty"
-                self._append_line("Type: easy, medium, or hard.", "system")
-                return {"stay": True}
-            if self.hunt_mode == "choose-difficulty":
-                if t not in ("easy", "medium", "hard"):
-                    return {"feedback": "Type: easy, medium, or hard.", "stay": True}
-                initialize_hunt(t)
+            self._prompt_rooms()
+            return None
+        if self.hunt_mode == "choose-room":
+            room = t if t in self._room_set else None
+            if room is None:
+                return f"Type a room: {', '.join(self.active_rooms)}."
+            if room in self.killer_rooms:
+                if self.lives > 0:
+                    self.lives -= 1
+                    self._append_line("The killer attacks! You barely escape this time. Be careful.", _Kind.DANGER)
+                    self._append_line(f"You can survive {self.lives} more encounter(s).", _Kind.SYSTEM)
+                    self._prompt_rooms()
+                    return None
+                return "ending_caught_by_killer"
+            self.current_room = room
+            self.hunt_mode = "choose-item"
+            self._prompt_items(room)
+            return None
+        if self.hunt_mode == "choose-item":
+            room = self.current_room or ""
+            items = self.rooms.get(room, ())
+            exact_set, by_length = self._items_by_room.get(room, (frozenset(), ()))
+            if t in exact_set:
+                item_match: Optional[str] = t
+            else:
+                # Leading word wins ("under sink tub" -> "under sink"), then the longest item named anywhere
+                words = t.split()
+                item_match = self._item_first_token.get(room, {}).get(words[0]) if words else None
+                if item_match is None or item_match not in t:
+                    item_match = next((i for i in by_length if i in t), None)
+            if item_match is None:
+                return f"In the {room}, type one of: {' / '.join(items)}"
+            idx = self._room_idx[room] * self._max_items + self._item_idx[room][item_match]
+            if self._clue_mask[idx] and not self._found_mask[idx]:
+                self._found_mask[idx] = 1
+                self._found_count += 1
                 self._append_line(
-                    f"Find {self.required_clues} clues without entering the killer's room.",
-                    "system",
+                    f"You found a clue in the {room} ({item_match}). ({self._found_count}/{self.required_clues})",
+                    _Kind.SYSTEM,
                 )
-                prompt_rooms()
-                return {"stay": True}
-            if self.hunt_mode == "choose-room":
-                room = next((r for r in self.active_rooms if t == r), None)
-                if room is None:
-                    return {"feedback": f"Type a room: {', '.join(self.active_rooms)}.", "stay": True}
-                if room in self.killer_rooms:
-                    if self.lives > 0:
-                        self.lives -= 1
-                        self._append_line("The killer attacks! You barely escape this time. Be careful.", "danger")
-                        self._append_line(f"You can survive {self.lives} more encounter(s).", "system")
-                        prompt_rooms()
-                        return {"stay": True}
-                    return "ending_caught_by_killer"
-                self.current_room = room
-                self.hunt_mode = "choose-item"
-                prompt_items(room)
-                return {"stay": True}
-            if self.hunt_mode == "choose-item":
-                room = self.current_room or ""
-                items = self.rooms.get(room, [])
-                item_match = next((i for i in items if t == i or i in t), None)
-                if item_match is None:
-                    return {"feedback": f"In the {room}, type one of: {' / '.join(items)}", "stay": True}
-                key = f"{room}|{item_match}"
-                if key in self.clue_pairs and key not in self.found_pairs:
-                    self.found_pairs.add(key)
-                    self._append_line(
-                        f"You found a clue in the {room} ({item_match}). ({len(self.found_pairs)}/{self.required_clues})",
-                        "system",
-                    )
-                elif key not in self.clue_pairs:
-                    self._append_line("Nothing here. Keep looking.", "system")
-                else:
-                    self._append_line("You already found this clue.", "system")
-                if len(self.found_pairs) >= self.required_clues:
-                    return "ending_all_clues"
-                self.hunt_mode = "choose-room"
-                self.current_room = None
-                prompt_rooms()
-                return {"stay": True}
-            return {"stay": True}
-
-        def avoid_parse(inp: str) -> Union[str, Dict[str, Union[str, bool]]]:
-            t = normalize(inp)
-            if t in ["y", "yes"]:
-                return "investigate"
-            if t in ["n", "no"]:
-                return "ending_avoid"
-            return {"feedback": 'Answer "yes" or "no".', "stay": True}
-
-        def call_police_parse(inp: str) -> Union[str, Dict[str, Union[str, bool]]]:
-            t = normalize(inp)
-            if "wait" in t:
-                return "ending_police_wait"
-            if any(k in t for k in ["go", "warehouse", "head", "move"]):
-                return "warehouse"
-            return {"feedback": 'Type "wait" or "go".', "stay": True}
-
-        def warehouse_parse(inp: str) -> Union[str, Dict[str, Union[str, bool]]]:
-            t = normalize(inp)
-            if "pipe" in t:
-                return "ending_confront"
-            if "call" in t:
-                return "ending_betrayed"
-            return {"feedback": 'Type "pipe" or "call".', "stay": True}
-
-        return {
-            "prologue": Scene(
-                text=[
-                    "You are a homicide detective, called to a chilling case.",
-                    "They call the suspect the 'House Hunter'—a predator who stalks homes after dark.",
-                    "Find the clues, avoid the killer, and end the spree.",
-                ]
-            ),
-            "start": Scene(
-                text=[
-                    "There is a killer on the loose. Should we try to stop them? (yes/no)",
-                ],
-                parse=start_parse,
-            ),
-            "investigate": Scene(
-                text=[
-                    "You choose to intervene. We need clues before the killer finds us.",
-                    "Respond with anything to continue.",
-                ],
-                parse=investigate_parse,
-            ),
-            "hunt": Scene(
-                text=[],
-                parse=hunt_parse,
-            ),
-            "avoid": Scene(
-                text=[
-                    "You decide to stay out of it and lock your doors.",
-                    "Hours pass. Sirens wail in the distance. Guilt gnaws at you.",
-                    "Do you change your mind and get involved? (yes/no)",
-                ],
-                parse=avoid_parse,
-            ),
-            "callPolice": Scene(
-                text=[
-                    "You call the police and report the last known location.",
-                    "They advise you to keep your distance. Do you wait or head to the warehouse anyway? (wait/go)",
-                ],
-                parse=call_police_parse,
-            ),
-            "warehouse": Scene(
-                text=[
-                    "The warehouse is dark. You hear footsteps above. There is a loose pipe nearby.",
-                    "Do you arm yourself with the pipe or quietly call out? (pipe/call)",
-                ],
-                parse=warehouse_parse,
-            ),
-            # Endings
-            "ending_caught_by_killer": Scene(
-                text=[
-                    "You step into the room and the door slams behind you.",
-                    "Breath at your neck. Wrong room. THE END.",
-                ],
-                danger=True,
-            ),
-            "ending_all_clues": Scene(
-                text=[
-                    "Piece by piece, the truth emerges from the clues you gathered.",
-                    "You alert the authorities with precise details. The killer is caught without another victim. THE END.",
-                ],
-            ),
-            "ending_avoid": Scene(
-                text=[
-                    "Days later, the news reports an arrest made after another close call.",
-                    "You are safe, but the what-ifs linger. THE END.",
-                ]
-            ),
-            "ending_police_wait": Scene(
-                text=[
-                    "You wait. Police storm the warehouse and apprehend the suspect.",
-                    "Your caution may have saved you—and someone else. THE END.",
-                ]
-            ),
-            "ending_confront": Scene(
-                text=[
-                    "With the pipe in hand, you creak up the stairs. A shadow lunges.",
-                    "You parry, shouting for help. Sirens swell outside—backup arrives just in time. THE END.",
-                ]
-            ),
-            "ending_betrayed": Scene(
-                text=[
-                    '"Hello?" you whisper. The footsteps stop. A voice behind you: "Found you."',
-                    "Trust can be deadly in the dark. THE END.",
-                ],
-                danger=True,
-            ),
-        }
+            elif not self._clue_mask[idx]:
+                self._append_line("Nothing here. Keep looking.", _Kind.SYSTEM)
+            else:
+                self._append_line("You already found this clue.", _Kind.SYSTEM)
+            if self._found_count >= self.required_clues:
+                return "ending_all_clues"
+            self.hunt_mode = "choose-room"
+            self.current_room = None
+            self._prompt_rooms()
+            return None
+        return None
+
+    def _parse_avoid(self, inp: str, t: str) -> Optional[str]:
+        if t in ["y", "yes"]:
+            return "investigate"
+        if t in ["n", "no"]:
+            return "ending_avoid"
+        return 'Answer "yes" or "no".'
+
+    def _parse_call_police(self, inp: str, t: str) -> Optional[str]:
+        if "wait" in t:
+            return "ending_police_wait"
+        if any(k in t for k in ["go", "warehouse", "head", "move"]):
+            return "warehouse"
+        return 'Type "wait" or "go".'
+
+    def _parse_warehouse(self, inp: str, t: str) -> Optional[str]:
+        if "pipe" in t:
+            return "ending_confront"
+        if "call" in t:
+            return "ending_betrayed"
+        return 'Type "pipe" or "call".'
 
 
 def main() -> int: